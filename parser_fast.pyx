@@ -0,0 +1,279 @@
+# cython: language_level=3
+"""
+parser_fast.pyx - Cython build of the heuristic quiz parser.
+
+A typed copy of parser_standalone.heuristic_parse. Build in place with:
+
+    python setup.py build_ext --inplace
+
+parser_standalone.py imports this module when present and falls back to its
+pure-Python implementation otherwise. quiz_generator_tk.py keeps its own
+parser: its cleaning/marker semantics deliberately differ, so this module
+must not be substituted there.
+"""
+import re
+from functools import lru_cache
+
+from parser_standalone import Question
+
+try:
+    import re2 as _re2
+except Exception:
+    _re2 = None
+
+
+def _compile(pattern):
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+# lines are stripped once up front (see heuristic_parse), so the patterns
+# can anchor directly at position 0 instead of re-skipping leading blanks
+_NUM_RE = _compile(r"^(\d+)\s*[\).\-:]?\s*(.*)$")
+_OPT_PREFIX_RE = _compile(r'^[A-Da-d][\)\.\-: ]')
+_BULLET_RE = _compile(r'^[\-•]\s+')
+_BULLET_STRIP_RE = _compile(r"^[\-•]\s*")
+_LEAD_LETTER_PUNCT_RE = _compile(r"^[A-Za-z]\s*[\)\.\-:]\s*")
+_LEAD_AD_SPACE_RE = _compile(r'^[A-D]\s+')
+# Inline-option separators (`||`, `|`, `;`) all map to one sentinel so the
+# split is a single C-level translate+split pass instead of a regex; `||`
+# just yields an empty part, which the loop already filters.
+_SEP_TABLE = str.maketrans({'|': '\x01', ';': '\x01'})
+_SINGLE_LETTER_RE = _compile(r'^([A-Da-d])[\.)]?$')
+_CAP_SHORT_RE = _compile(r'^[A-Z][a-z].{0,120}$')
+# First-character dispatch table for the option-collection loop: the leading
+# character alone decides which branch patterns can possibly succeed, so a
+# single table lookup replaces the failed regex probes for the other branches.
+_K_OTHER, _K_DIGIT, _K_LETTER, _K_BULLET, _K_UPPER = 0, 1, 2, 3, 4
+_DISPATCH = [_K_OTHER] * 256
+# iterate over ints, not bytes: under Cython a bytes loop binds length-1
+# bytes objects, which are not valid list indices
+for _c in range(ord('0'), ord('9') + 1):
+    _DISPATCH[_c] = _K_DIGIT
+for _c in map(ord, 'ABCDabcd'):
+    _DISPATCH[_c] = _K_LETTER
+_DISPATCH[ord('-')] = _K_BULLET
+for _c in range(ord('E'), ord('Z') + 1):
+    _DISPATCH[_c] = _K_UPPER
+del _c
+
+
+def _line_kind(s):
+    c = ord(s[0])
+    if c < 256:
+        return _DISPATCH[c]
+    return _K_BULLET if c == 0x2022 else _K_OTHER  # 0x2022 is the bullet '•' 
+
+
+cdef tuple _strip_trailing_letter(str o):
+    """Strip a trailing A-D correctness marker like 'D', '(B)' or 'C.' from
+    an option, returning (remaining_text, letter) or (o, None) when absent.
+
+    Hand-rolled equivalent of the old end-anchored regex; only the last few
+    characters are inspected instead of walking the whole string.
+    """
+    cdef str s = o
+    cdef str letter, pre
+    if s.endswith('.'):
+        s = s[:-1]
+    if s and s[-1] in ')]':
+        s = s[:-1]
+    if not s or s[-1] not in 'ABCD':
+        return o, None
+    letter = s[-1]
+    pre = s[:-1]
+    if pre and pre[-1] in '([':
+        pre = pre[:-1]
+    elif pre and (pre[-1].isalnum() or pre[-1] == '_'):
+        # no bracket and the letter is part of a word (e.g. "DNA"): not a marker
+        return o, None
+    return pre.rstrip(), letter
+
+
+# def rather than cdef so lru_cache can wrap it: repeated prefix shapes in
+# pasted dumps ("A) ", "B. ") then skip both re.sub passes entirely.
+@lru_cache(maxsize=4096)
+def clean_option_text(str s):
+    s = s.strip()
+    # remove leading letter+punctuation like "A) " or "A. " or "A: " or "A "
+    s = _LEAD_LETTER_PUNCT_RE.sub("", s)
+    # also try simple letter+space if no punctuation; slice at the match end
+    # so the engine runs once instead of a match probe plus a sub
+    m = _LEAD_AD_SPACE_RE.match(s)
+    if m:
+        s = s[m.end():]
+    s = _BULLET_STRIP_RE.sub("", s)
+    return s.strip()
+
+
+def heuristic_parse(str text):
+    """Return a list of Question records parsed heuristically from raw text.
+
+    Typed copy of parser_standalone.heuristic_parse; see that module for the
+    behavior notes.
+    """
+    # strip each line exactly once up front; later accesses reuse the
+    # cached stripped form instead of re-allocating via .strip()
+    cdef list lines = [l.strip() for l in text.splitlines()]
+    cdef list questions = []
+    cdef list opts, parts
+    cdef Py_ssize_t i = 0, j, idx, ci, opt_n
+    cdef Py_ssize_t n = len(lines)
+    cdef str line, s, qtext, num, after, letter, cleaned, p, o, new_o
+    cdef int kind
+    cdef object m, mnum, correct_index, pending_correct_letter
+    cdef bint opts_found
+
+    while i < n:
+        line = lines[i]
+        if not line:
+            i += 1
+            continue
+
+        # Detect question start
+        qtext = None
+        # numbered like '1. Question' or '1 Question'
+        mnum = _NUM_RE.match(line)
+        if mnum and (line.endswith('?') or '?' in line or len(mnum.group(2)) > 0):
+            num = mnum.group(1)
+            after = mnum.group(2).strip()
+            # Reconstruct with number: "1. Question..."
+            qtext = num + '. ' + after if after else line
+            i += 1
+        elif line.lower().startswith('q') and '?' in line:
+            qtext = line
+            i += 1
+        elif line.endswith('?') or '........' in line or line.lower().startswith('question'):
+            qtext = line
+            i += 1
+        else:
+            # peek ahead for options - if present, treat this line as question
+            j = i + 1
+            opts_found = False
+            while j < min(n, i + 6):
+                if _OPT_PREFIX_RE.match(lines[j]) or _BULLET_RE.match(lines[j]):
+                    opts_found = True
+                    break
+                j += 1
+            if opts_found:
+                qtext = line
+                i += 1
+            else:
+                i += 1
+                continue
+
+        # collect options
+        # MCQs are virtually always 4 options: pre-size the slots and keep a
+        # fill counter so the common case never takes the list-growth path
+        opts = [None] * 4
+        opt_n = 0
+        pending_correct_letter = None
+        while i < n:
+            s = lines[i]
+            if not s:
+                i += 1
+                break
+            kind = _line_kind(s)
+            if kind == _K_LETTER:
+                # single-letter line 'A' or 'B' etc -> correctness marker
+                if _SINGLE_LETTER_RE.match(s):
+                    letter = s[0].upper()
+                    # remember the marker
+                    pending_correct_letter = letter
+                    i += 1
+                    continue
+                if _OPT_PREFIX_RE.match(s):
+                    cleaned = clean_option_text(s)
+                    if cleaned:
+                        if opt_n < 4:
+                            opts[opt_n] = cleaned
+                        else:
+                            opts.append(cleaned)
+                        opt_n += 1
+                    i += 1
+                    continue
+            elif kind == _K_DIGIT:
+                # next question detection: the dispatch kind already proves
+                # the leading digit, which is all the old prefix regex could
+                # test here, so only the question-shape check remains
+                if s.endswith('?') or len(s.split()) > 2:
+                    break
+            elif kind == _K_BULLET:
+                if _BULLET_RE.match(s):
+                    cleaned = clean_option_text(s)
+                    if cleaned:
+                        if opt_n < 4:
+                            opts[opt_n] = cleaned
+                        else:
+                            opts.append(cleaned)
+                        opt_n += 1
+                    i += 1
+                    continue
+            if ('|' in s or ';' in s) and ('||' in s or s.count('|') > 1 or ';' in s):
+                parts = s.translate(_SEP_TABLE).split('\x01')
+                for p in parts:
+                    p = p.strip()
+                    if p:
+                        if opt_n < 4:
+                            opts[opt_n] = clean_option_text(p)
+                        else:
+                            opts.append(clean_option_text(p))
+                        opt_n += 1
+                i += 1
+                continue
+            if ',' in s and len(s) < 120 and opt_n == 0:
+                parts = [p.strip() for p in s.split(',') if p.strip()]
+                if len(parts) >= 2:
+                    for p in parts:
+                        if opt_n < 4:
+                            opts[opt_n] = clean_option_text(p)
+                        else:
+                            opts.append(clean_option_text(p))
+                        opt_n += 1
+                    i += 1
+                    continue
+            # short line starting with capital could be an option
+            if kind in (_K_LETTER, _K_UPPER) and _CAP_SHORT_RE.match(s) and len(s.split()) <= 8 and opt_n < 6:
+                if opt_n < 4:
+                    opts[opt_n] = clean_option_text(s)
+                else:
+                    opts.append(clean_option_text(s))
+                opt_n += 1
+                i += 1
+                continue
+            break
+
+        # drop the unused pre-sized slots
+        if opt_n < 4:
+            del opts[opt_n:]
+
+        # detect trailing single-letter correctness markers
+        correct_index = None
+        for idx, o in enumerate(opts):
+            # cheap tail check first: a trailing marker can only end in the
+            # letter itself or closing punctuation, so most options skip the
+            # regex entirely
+            if not o or o[-1] not in 'ABCD])}.':
+                continue
+            new_o, letter = _strip_trailing_letter(o)
+            if letter is not None:
+                if new_o:
+                    opts[idx] = new_o
+                else:
+                    opts[idx] = o.strip()
+                if correct_index is None:
+                    correct_index = idx
+
+        # if we encountered a standalone letter line, apply it now
+        if correct_index is None and pending_correct_letter is not None:
+            ci = ord(pending_correct_letter) - 65
+            if 0 <= ci < len(opts):
+                correct_index = ci
+
+        questions.append(Question(qtext.strip(), opts, correct_index, ''))
+
+    return questions
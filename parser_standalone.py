@@ -1,164 +1,393 @@
-#!/usr/bin/env python3
-"""
-parser_standalone.py - Heuristic quiz parser without Tk/GUI dependencies
-"""
-import re
-import json
-
-
-def heuristic_parse(text):
-    """Return a list of question dicts parsed heuristically from raw text.
-
-    Behavior:
-    - Detect numbered questions like "1 Question..." or "1. Question" or lines starting with a number.
-    - Collect following lettered options (A/B/C/D), or lines starting with A., A) or just 'A ' + text.
-    - Handle inline option separators (||, |, ;) when present.
-    - Detect trailing correctness markers (A-D) in options and set `correct` index.
-    """
-    raw_lines = [l.rstrip() for l in text.splitlines()]
-    lines = raw_lines
-    questions = []
-    i = 0
-    n = len(lines)
-
-    def clean_option_text(s):
-        s = s.strip()
-        # remove leading letter+punctuation like "A) " or "A. " or "A: " or "A "
-        s = re.sub(r"^[A-Za-z]\s*[\)\.\-:]\s*", "", s)
-        # also try simple letter+space if no punctuation
-        if re.match(r'^[A-D]\s+', s):
-            s = re.sub(r'^[A-D]\s+', "", s)
-        s = re.sub(r"^[\-•]\s*", "", s)
-        return s.strip()
-
-    while i < n:
-        line = lines[i].strip()
-        if not line:
-            i += 1
-            continue
-
-        # Detect question start
-        qtext = None
-        # numbered like '1. Question' or '1 Question'
-        mnum = re.match(r"^\s*(\d+)\s*[\).\-:]?\s*(.*)$", line)
-        if mnum and (line.endswith('?') or '?' in line or len(mnum.group(2))>0):
-            num = mnum.group(1)
-            after = mnum.group(2).strip()
-            # Reconstruct with number: "1. Question..."
-            qtext = num + '. ' + after if after else line
-            i += 1
-        elif line.lower().startswith('q') and '?' in line:
-            qtext = line
-            i += 1
-        elif line.endswith('?') or '........' in line or line.lower().startswith('question'):
-            qtext = line
-            i += 1
-        else:
-            # peek ahead for options - if present, treat this line as question
-            j = i + 1
-            opts_found = False
-            while j < min(n, i + 6):
-                if re.match(r'^[A-Da-d][\)\.\-: ]', lines[j].strip()) or re.match(r'^[\-•]\s+', lines[j].strip()):
-                    opts_found = True
-                    break
-                j += 1
-            if opts_found:
-                qtext = line
-                i += 1
-            else:
-                i += 1
-                continue
-
-        # collect options
-        opts = []
-        pending_correct_letter = None
-        while i < n:
-            s = lines[i].strip()
-            if not s:
-                i += 1
-                break
-            # single-letter line 'A' or 'B' etc -> correctness marker
-            m_single = re.match(r'^([A-Da-d])[\.)]?$' , s)
-            if m_single and len(s.strip()) <= 3:
-                letter = m_single.group(1).upper()
-                # remember the marker
-                pending_correct_letter = letter
-                i += 1
-                continue
-            # next question detection
-            if re.match(r'^\s*\d+\s*[\).\-:]?\s*', s) and (s.endswith('?') or len(s.split())>2):
-                break
-            if re.match(r'^[A-Da-d][\)\.\-: ]', s) or re.match(r'^[\-•]\s+', s):
-                cleaned = clean_option_text(s)
-                if cleaned:
-                    opts.append(cleaned)
-                i += 1
-                continue
-            if '||' in s or ('|' in s and s.count('|')>1) or ';' in s:
-                parts = re.split(r"\|\||\||;", s)
-                for p in parts:
-                    p = p.strip()
-                    if p:
-                        opts.append(clean_option_text(p))
-                i += 1
-                continue
-            if ',' in s and len(s) < 120 and len(opts) == 0:
-                parts = [p.strip() for p in s.split(',') if p.strip()]
-                if len(parts) >= 2:
-                    for p in parts:
-                        opts.append(clean_option_text(p))
-                    i += 1
-                    continue
-            # short line starting with capital could be an option
-            if re.match(r'^[A-Z][a-z].{0,120}$', s) and len(s.split()) <= 8 and len(opts) < 6:
-                opts.append(clean_option_text(s))
-                i += 1
-                continue
-            break
-
-        # detect trailing single-letter correctness markers
-        correct_index = None
-        for idx, o in enumerate(opts):
-            m = re.search(r"(?:\(|\[)?\b([A-D])\b(?:\)|\])?[\.]?$", o)
-            if m:
-                new_o = re.sub(r"(?:\(|\[)?\b([A-D])\b(?:\)|\])?[\.]?$", '', o).strip()
-                if new_o:
-                    opts[idx] = new_o
-                else:
-                    opts[idx] = o.strip()
-                if correct_index is None:
-                    correct_index = idx
-
-        # if we encountered a standalone letter line, apply it now
-        if correct_index is None and pending_correct_letter is not None:
-            ci = ord(pending_correct_letter) - 65
-            if 0 <= ci < len(opts):
-                correct_index = ci
-
-        questions.append({'text': qtext.strip(), 'options': opts, 'correct': correct_index, 'explanation': ''})
-
-    return questions
-
-
-if __name__ == '__main__':
-    sample = '''1 Which of the following is not a feature of a village?
-A Less population
-B Less diversity
-C Impersonal relationship
-D Predominance of primary sector and allied activities
-2 Which among the following is not a form of diversity in India?
-A Geographical diversity
-B Linguistic diversity D
-C Religious diversity
-D None of the above
-3 Caste is not a/an ........................
-A Endogamous system
-D
-B Hereditary system
-C Hierarchical system
-D Exogamous system
-4 Marriage of one man with several sisters is called ......................
-A Monogamous marriage
-'''
-    parsed = heuristic_parse(sample)
-    print(json.dumps(parsed, indent=2, ensure_ascii=False))
+#!/usr/bin/env python3
+"""
+parser_standalone.py - Heuristic quiz parser without Tk/GUI dependencies
+"""
+import re
+import json
+from functools import lru_cache
+
+# Prefer google-re2 (linear-time, C++ core) when the wheel is available; the
+# patterns below are all pure-regular so re2 accepts them unchanged. Fall back
+# to the stdlib backtracking engine otherwise.
+try:
+    import re2 as _re2
+except Exception:
+    _re2 = None
+
+
+def _compile(pattern):
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+# Precompiled patterns used by heuristic_parse. Compiling once at import time
+# avoids the per-call cache lookup inside re.match/re.sub on every line.
+# lines are stripped once up front (see heuristic_parse), so the patterns
+# can anchor directly at position 0 instead of re-skipping leading blanks
+_NUM_RE = _compile(r"^(\d+)\s*[\).\-:]?\s*(.*)$")
+_OPT_PREFIX_RE = _compile(r'^[A-Da-d][\)\.\-: ]')
+_BULLET_RE = _compile(r'^[\-•]\s+')
+_BULLET_STRIP_RE = _compile(r"^[\-•]\s*")
+_SINGLE_LETTER_RE = _compile(r'^([A-Da-d])[\.)]?$')
+_LEAD_LETTER_PUNCT_RE = _compile(r"^[A-Za-z]\s*[\)\.\-:]\s*")
+_LEAD_AD_SPACE_RE = _compile(r'^[A-D]\s+')
+# Inline-option separators (`||`, `|`, `;`) all map to one sentinel so the
+# split is a single C-level translate+split pass instead of a regex; `||`
+# just yields an empty part, which the loop already filters.
+_SEP_TABLE = str.maketrans({'|': '\x01', ';': '\x01'})
+_CAP_SHORT_RE = _compile(r'^[A-Z][a-z].{0,120}$')
+# First-character dispatch table for the option-collection loop: the leading
+# character alone decides which branch patterns can possibly succeed, so a
+# single table lookup replaces the failed regex probes for the other branches.
+_K_OTHER, _K_DIGIT, _K_LETTER, _K_BULLET, _K_UPPER = 0, 1, 2, 3, 4
+_DISPATCH = [_K_OTHER] * 256
+for _c in b'0123456789':
+    _DISPATCH[_c] = _K_DIGIT
+for _c in b'ABCDabcd':
+    _DISPATCH[_c] = _K_LETTER
+_DISPATCH[ord('-')] = _K_BULLET
+for _c in range(ord('E'), ord('Z') + 1):
+    _DISPATCH[_c] = _K_UPPER
+del _c
+
+
+def _line_kind(s):
+    c = ord(s[0])
+    if c < 256:
+        return _DISPATCH[c]
+    return _K_BULLET if c == 0x2022 else _K_OTHER  # 0x2022 is the bullet '•' 
+
+
+
+# Optional Hyperscan batch classifier: when the wheel is available and the
+# input is big enough to amortise the sweep, one vectorised scan over the
+# whole text precomputes which branch patterns match each line, so the
+# option loop below does no per-line regex calls at all.
+try:
+    import hyperscan as _hyperscan
+except Exception:
+    _hyperscan = None
+
+_H_SINGLE, _H_OPT, _H_BULLET, _H_CAP = 1, 2, 4, 8
+_hs_db = None
+
+
+def _hs_database():
+    global _hs_db
+    if _hs_db is None:
+        flags = (_hyperscan.HS_FLAG_MULTILINE | _hyperscan.HS_FLAG_UTF8
+                 | _hyperscan.HS_FLAG_SOM_LEFTMOST)
+        db = _hyperscan.Database()
+        db.compile(
+            expressions=[
+                br'^[A-Da-d][.)]?$',
+                br'^[A-Da-d][).\-: ]',
+                '^[-\u2022]\\s+'.encode('utf-8'),
+                br'^[A-Z][a-z].{0,120}$',
+            ],
+            ids=[_H_SINGLE, _H_OPT, _H_BULLET, _H_CAP],
+            elements=4,
+            flags=[flags] * 4,
+        )
+        _hs_db = db
+    return _hs_db
+
+
+def _line_masks(lines):
+    """Return a per-line bitmask of branch-pattern hits, or None to fall back
+    to the per-line dispatch path."""
+    if _hyperscan is None or len(lines) < 256:
+        return None
+    try:
+        db = _hs_database()
+    except Exception:
+        return None
+    index_at = {}
+    parts = []
+    off = 0
+    for idx, l in enumerate(lines):
+        index_at[off] = idx
+        b = l.encode('utf-8')
+        parts.append(b)
+        off += len(b) + 1
+    masks = [0] * len(lines)
+
+    def on_match(pid, from_, to, flags, context):
+        li = index_at.get(from_)
+        if li is not None:
+            masks[li] |= pid
+
+    try:
+        db.scan(b'\n'.join(parts), match_event_handler=on_match)
+    except Exception:
+        return None
+    return masks
+
+
+class Question:
+    """One parsed question. __slots__ keeps the record to its four fields
+    instead of a ~230-byte dict per question, which matters when parsing
+    large pasted dumps."""
+    __slots__ = ('text', 'options', 'correct', 'explanation')
+
+    def __init__(self, text, options, correct=None, explanation=''):
+        self.text = text
+        self.options = options
+        self.correct = correct
+        self.explanation = explanation
+
+    def to_dict(self):
+        """Return the question dict shape the site's JS/JSON exports expect."""
+        return {'text': self.text, 'options': self.options,
+                'correct': self.correct, 'explanation': self.explanation}
+
+
+def _strip_trailing_letter(o):
+    """Strip a trailing A-D correctness marker like 'D', '(B)' or 'C.' from
+    an option, returning (remaining_text, letter) or (o, None) when absent.
+
+    Hand-rolled equivalent of the old end-anchored regex; only the last few
+    characters are inspected instead of walking the whole string.
+    """
+    s = o
+    if s.endswith('.'):
+        s = s[:-1]
+    if s and s[-1] in ')]':
+        s = s[:-1]
+    if not s or s[-1] not in 'ABCD':
+        return o, None
+    letter = s[-1]
+    pre = s[:-1]
+    if pre and pre[-1] in '([':
+        pre = pre[:-1]
+    elif pre and (pre[-1].isalnum() or pre[-1] == '_'):
+        # no bracket and the letter is part of a word (e.g. "DNA"): not a marker
+        return o, None
+    return pre.rstrip(), letter
+
+
+@lru_cache(maxsize=4096)
+def clean_option_text(s):
+    """Strip option-letter/bullet prefixes from one candidate option line.
+
+    Cached because pasted dumps repeat the same prefix shapes ("A) ", "B. ")
+    over and over; repeated inputs skip both re.sub passes entirely.
+    """
+    s = s.strip()
+    # remove leading letter+punctuation like "A) " or "A. " or "A: " or "A "
+    s = _LEAD_LETTER_PUNCT_RE.sub("", s)
+    # also try simple letter+space if no punctuation; slice at the match end
+    # so the engine runs once instead of a match probe plus a sub
+    m = _LEAD_AD_SPACE_RE.match(s)
+    if m:
+        s = s[m.end():]
+    s = _BULLET_STRIP_RE.sub("", s)
+    return s.strip()
+
+
+def heuristic_parse(text):
+    """Return a list of Question records parsed heuristically from raw text.
+
+    Behavior:
+    - Detect numbered questions like "1 Question..." or "1. Question" or lines starting with a number.
+    - Collect following lettered options (A/B/C/D), or lines starting with A., A) or just 'A ' + text.
+    - Handle inline option separators (||, |, ;) when present.
+    - Detect trailing correctness markers (A-D) in options and set `correct` index.
+    """
+    # strip each line exactly once up front; later accesses reuse the
+    # cached stripped form instead of re-allocating via .strip()
+    lines = [l.strip() for l in text.splitlines()]
+    # per-line pattern-hit bitmasks from the Hyperscan sweep, or None
+    masks = _line_masks(lines)
+    questions = []
+    i = 0
+    n = len(lines)
+
+    while i < n:
+        line = lines[i]
+        if not line:
+            i += 1
+            continue
+
+        # Detect question start
+        qtext = None
+        # numbered like '1. Question' or '1 Question'
+        mnum = _NUM_RE.match(line)
+        if mnum and (line.endswith('?') or '?' in line or len(mnum.group(2))>0):
+            num = mnum.group(1)
+            after = mnum.group(2).strip()
+            # Reconstruct with number: "1. Question..."
+            qtext = num + '. ' + after if after else line
+            i += 1
+        elif line.lower().startswith('q') and '?' in line:
+            qtext = line
+            i += 1
+        elif line.endswith('?') or '........' in line or line.lower().startswith('question'):
+            qtext = line
+            i += 1
+        else:
+            # peek ahead for options - if present, treat this line as question
+            j = i + 1
+            opts_found = False
+            while j < min(n, i + 6):
+                if _OPT_PREFIX_RE.match(lines[j]) or _BULLET_RE.match(lines[j]):
+                    opts_found = True
+                    break
+                j += 1
+            if opts_found:
+                qtext = line
+                i += 1
+            else:
+                i += 1
+                continue
+
+        # collect options
+        # MCQs are virtually always 4 options: pre-size the slots and keep a
+        # fill counter so the common case never takes the list-growth path
+        opts = [None] * 4
+        opt_n = 0
+        pending_correct_letter = None
+        while i < n:
+            s = lines[i]
+            if not s:
+                i += 1
+                break
+            kind = _line_kind(s)
+            hit = None if masks is None else masks[i]
+            if kind == _K_LETTER:
+                # single-letter line 'A' or 'B' etc -> correctness marker
+                if (hit & _H_SINGLE) if hit is not None else _SINGLE_LETTER_RE.match(s):
+                    letter = s[0].upper()
+                    # remember the marker
+                    pending_correct_letter = letter
+                    i += 1
+                    continue
+                if (hit & _H_OPT) if hit is not None else _OPT_PREFIX_RE.match(s):
+                    cleaned = clean_option_text(s)
+                    if cleaned:
+                        if opt_n < 4:
+                            opts[opt_n] = cleaned
+                        else:
+                            opts.append(cleaned)
+                        opt_n += 1
+                    i += 1
+                    continue
+            elif kind == _K_DIGIT:
+                # next question detection: the dispatch kind already proves
+                # the leading digit, which is all the old prefix regex could
+                # test here, so only the question-shape check remains
+                if s.endswith('?') or len(s.split()) > 2:
+                    break
+            elif kind == _K_BULLET:
+                if (hit & _H_BULLET) if hit is not None else _BULLET_RE.match(s):
+                    cleaned = clean_option_text(s)
+                    if cleaned:
+                        if opt_n < 4:
+                            opts[opt_n] = cleaned
+                        else:
+                            opts.append(cleaned)
+                        opt_n += 1
+                    i += 1
+                    continue
+            if ('|' in s or ';' in s) and ('||' in s or s.count('|')>1 or ';' in s):
+                parts = s.translate(_SEP_TABLE).split('\x01')
+                for p in parts:
+                    p = p.strip()
+                    if p:
+                        if opt_n < 4:
+                            opts[opt_n] = clean_option_text(p)
+                        else:
+                            opts.append(clean_option_text(p))
+                        opt_n += 1
+                i += 1
+                continue
+            if ',' in s and len(s) < 120 and opt_n == 0:
+                parts = [p.strip() for p in s.split(',') if p.strip()]
+                if len(parts) >= 2:
+                    for p in parts:
+                        if opt_n < 4:
+                            opts[opt_n] = clean_option_text(p)
+                        else:
+                            opts.append(clean_option_text(p))
+                        opt_n += 1
+                    i += 1
+                    continue
+            # short line starting with capital could be an option
+            if kind in (_K_LETTER, _K_UPPER) and ((hit & _H_CAP) if hit is not None else _CAP_SHORT_RE.match(s)) and len(s.split()) <= 8 and opt_n < 6:
+                if opt_n < 4:
+                    opts[opt_n] = clean_option_text(s)
+                else:
+                    opts.append(clean_option_text(s))
+                opt_n += 1
+                i += 1
+                continue
+            break
+
+        # drop the unused pre-sized slots
+        if opt_n < 4:
+            del opts[opt_n:]
+
+        # detect trailing single-letter correctness markers
+        correct_index = None
+        for idx, o in enumerate(opts):
+            # cheap tail check first: a trailing marker can only end in the
+            # letter itself or closing punctuation, so most options skip the
+            # regex entirely
+            if not o or o[-1] not in 'ABCD])}.':
+                continue
+            new_o, letter = _strip_trailing_letter(o)
+            if letter is not None:
+                if new_o:
+                    opts[idx] = new_o
+                else:
+                    opts[idx] = o.strip()
+                if correct_index is None:
+                    correct_index = idx
+
+        # if we encountered a standalone letter line, apply it now
+        if correct_index is None and pending_correct_letter is not None:
+            ci = ord(pending_correct_letter) - 65
+            if 0 <= ci < len(opts):
+                correct_index = ci
+
+        questions.append(Question(qtext.strip(), opts, correct_index, ''))
+
+    return questions
+
+
+# Prefer the Cython-compiled parser when it has been built (see setup.py);
+# keep the pure-Python implementation above as the fallback. Any failure in
+# the optional accelerator (not just a missing build) must not take down
+# every importer of this module.
+try:
+    from parser_fast import heuristic_parse  # noqa: F811
+except Exception:
+    pass
+
+
+if __name__ == '__main__':
+    sample = '''1 Which of the following is not a feature of a village?
+A Less population
+B Less diversity
+C Impersonal relationship
+D Predominance of primary sector and allied activities
+2 Which among the following is not a form of diversity in India?
+A Geographical diversity
+B Linguistic diversity D
+C Religious diversity
+D None of the above
+3 Caste is not a/an ........................
+A Endogamous system
+D
+B Hereditary system
+C Hierarchical system
+D Exogamous system
+4 Marriage of one man with several sisters is called ......................
+A Monogamous marriage
+'''
+    parsed = heuristic_parse(sample)
+    print(json.dumps([q.to_dict() for q in parsed], indent=2, ensure_ascii=False))
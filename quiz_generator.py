@@ -1,154 +1,263 @@
-"""
-quiz_generator.py
-
-Simple CLI to generate JavaScript quiz arrays compatible with the site's format.
-
-Usage examples:
-  # Convert a CSV to a JS file
-  python quiz_generator.py --csv QUIZ_TEMPLATE.csv --out generated_quizzes.js
-
-CSV format (header):
-  quiz_id,subject,unit,name,cycle,difficulty,question_text,options,correct,explanation
-
-- `quiz_id` groups questions into a quiz. All rows with same quiz_id belong to one quiz.
-- `options` should be separated with the pipe symbol `||`.
-- `correct` should be the index of the correct option (0-based) or the exact option text.
-
-Output: a JS file exporting a function `getGeneratedQuizzes()` that returns an array of quiz objects.
-Each quiz object includes at minimum: id, subject, unit (int), name, questions (array).
-Each question object has: text, options (array), correct (index int), explanation.
-
-"""
-import argparse
-import csv
-import json
-import sys
-from collections import OrderedDict
-
-
-def parse_csv(path):
-    quizzes = OrderedDict()
-    with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader, start=1):
-            qid = (row.get('quiz_id') or '').strip()
-            if not qid:
-                print(f"Skipping row {i}: missing quiz_id", file=sys.stderr)
-                continue
-            subject = (row.get('subject') or '').strip() or 'General'
-            unit_raw = (row.get('unit') or '').strip()
-            try:
-                unit = int(unit_raw) if unit_raw != '' else None
-            except ValueError:
-                unit = None
-            name = (row.get('name') or '').strip() or qid
-            cycle = (row.get('cycle') or '').strip() or None
-            difficulty = (row.get('difficulty') or '').strip() or None
-
-            qtext = (row.get('question_text') or '').strip()
-            options_raw = (row.get('options') or '').strip()
-            options = [opt.strip() for opt in options_raw.split('||')] if options_raw else []
-            correct_raw = (row.get('correct') or '').strip()
-            explanation = (row.get('explanation') or '').strip() or ''
-
-            # determine correct index
-            correct_index = None
-            if correct_raw != '':
-                if correct_raw.isdigit():
-                    try:
-                        idx = int(correct_raw)
-                        if 0 <= idx < len(options):
-                            correct_index = idx
-                    except Exception:
-                        correct_index = None
-                else:
-                    # try to match option text
-                    for idx, opt in enumerate(options):
-                        if opt.strip().lower() == correct_raw.strip().lower():
-                            correct_index = idx
-                            break
-            # fallback: 0
-            if correct_index is None and options:
-                correct_index = 0
-
-            question_obj = {
-                'text': qtext,
-                'options': options,
-                'correct': correct_index,
-                'explanation': explanation
-            }
-
-            if qid not in quizzes:
-                quizzes[qid] = {
-                    'id': qid,
-                    'subject': subject,
-                    'unit': unit,
-                    'name': name,
-                    'cycle': cycle,
-                    'difficulty': difficulty,
-                    'questions': []
-                }
-            quizzes[qid]['questions'].append(question_obj)
-
-    # Clean up None fields to match existing site's shape
-    out = []
-    for q in quizzes.values():
-        obj = {k: v for k, v in q.items() if v is not None}
-        out.append(obj)
-    return out
-
-
-def dump_as_js(quizzes, out_path, func_name='getGeneratedQuizzes'):
-    # JSON -> JS function that returns the array
-    js = f"function {func_name}() {{\n  return " + json.dumps(quizzes, ensure_ascii=False, indent=2) + ";\n}\n"
-    with open(out_path, 'w', encoding='utf-8') as f:
-        f.write(js)
-    print(f"Wrote {len(quizzes)} quizzes to {out_path}")
-
-
-def dump_as_json(quizzes, out_path):
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(quizzes, f, ensure_ascii=False, indent=2)
-    print(f"Wrote {len(quizzes)} quizzes to {out_path}")
-
-
-def main():
-    p = argparse.ArgumentParser(description='Generate JS/JSON quiz arrays for the Quiz Hub site')
-    p.add_argument('--csv', help='Input CSV file (see header format in script doc)')
-    p.add_argument('--out', default='generated_quizzes.js', help='Output file path')
-    p.add_argument('--format', choices=['js','json'], default='js', help='Output format')
-    p.add_argument('--func', default='getGeneratedQuizzes', help='If JS, function name to export')
-    # Accept and ignore unknown args (debugger/launcher may inject flags)
-    args, _unknown = p.parse_known_args()
-
-    if not args.csv:
-        p.print_help()
-        # don't raise SystemExit in interactive/debugger sessions
-        return
-
-    # validate input file early and show friendly message
-    try:
-        open(args.csv, 'r', encoding='utf-8').close()
-    except FileNotFoundError:
-        print(f"Error: CSV file not found: {args.csv}", file=sys.stderr)
-        return
-
-    quizzes = parse_csv(args.csv)
-    if args.format == 'js':
-        dump_as_js(quizzes, args.out, func_name=args.func)
-    else:
-        dump_as_json(quizzes, args.out)
-
-
-if __name__ == '__main__':
-    try:
-        main()
-    except SystemExit:
-        # prevent debugger / interactive sessions from showing a non-zero exit
-        pass
-    except Exception:
-        import traceback
-        traceback.print_exc()
-        # avoid forcing a non-zero exit when running under debuggers/launchers
-        # so the VS Code Python debug console doesn't show Exit Code 1
-        pass
+"""
+quiz_generator.py
+
+Simple CLI to generate JavaScript quiz arrays compatible with the site's format.
+
+Usage examples:
+  # Convert a CSV to a JS file
+  python quiz_generator.py --csv QUIZ_TEMPLATE.csv --out generated_quizzes.js
+
+CSV format (header):
+  quiz_id,subject,unit,name,cycle,difficulty,question_text,options,correct,explanation
+
+- `quiz_id` groups questions into a quiz. All rows with same quiz_id belong to one quiz.
+- `options` should be separated with the pipe symbol `||`.
+- `correct` should be the index of the correct option (0-based) or the exact option text.
+
+Output: a JS file exporting a function `getGeneratedQuizzes()` that returns an array of quiz objects.
+Each quiz object includes at minimum: id, subject, unit (int), name, questions (array).
+Each question object has: text, options (array), correct (index int), explanation.
+
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+
+
+def _parse_row(row):
+    """Parse one CSV row into (quiz_id, quiz_fields, question) tuples.
+
+    quiz_id is '' when the row is missing one; quiz_fields is a fresh quiz
+    object (empty questions list) that callers use when the id is first seen.
+    """
+    get = row.get
+    _strip = str.strip
+    qid = _strip(get('quiz_id') or '')
+    if not qid:
+        return '', None, None
+    subject = _strip(get('subject') or '') or 'General'
+    unit_raw = _strip(get('unit') or '')
+    try:
+        unit = int(unit_raw) if unit_raw != '' else None
+    except ValueError:
+        unit = None
+    name = _strip(get('name') or '') or qid
+    cycle = _strip(get('cycle') or '') or None
+    difficulty = _strip(get('difficulty') or '') or None
+
+    qtext = _strip(get('question_text') or '')
+    options_raw = _strip(get('options') or '')
+    options = list(map(_strip, options_raw.split('||'))) if options_raw else []
+    correct_raw = _strip(get('correct') or '')
+    explanation = _strip(get('explanation') or '') or ''
+
+    # determine correct index: try the int form once instead of the
+    # isdigit probe + separate conversion
+    correct_index = None
+    if correct_raw != '':
+        try:
+            idx = int(correct_raw)
+            if 0 <= idx < len(options):
+                correct_index = idx
+        except ValueError:
+            # try to match option text
+            lowered = correct_raw.lower()
+            for idx, opt in enumerate(options):
+                if opt.lower() == lowered:
+                    correct_index = idx
+                    break
+    # fallback: 0
+    if correct_index is None and options:
+        correct_index = 0
+
+    question = {
+        'text': qtext,
+        'options': options,
+        'correct': correct_index,
+        'explanation': explanation
+    }
+    quiz = {
+        'id': qid,
+        'subject': subject,
+        'unit': unit,
+        'name': name,
+        'cycle': cycle,
+        'difficulty': difficulty,
+        'questions': []
+    }
+    return qid, quiz, question
+
+
+def _finish_quiz(quiz):
+    # Clean up None fields to match existing site's shape
+    return {k: v for k, v in quiz.items() if v is not None}
+
+
+def _parse_quiz_group(rows):
+    """Build one finished quiz object from all rows sharing a quiz_id.
+
+    Module-level (not a closure) so ProcessPoolExecutor can pickle it.
+    """
+    quiz = None
+    for row in rows:
+        _qid, fresh, question = _parse_row(row)
+        if quiz is None:
+            quiz = fresh
+        quiz['questions'].append(question)
+    return _finish_quiz(quiz)
+
+
+# Below this many rows the process pool's startup + pickling overhead costs
+# more than the parsing it saves; stay serial.
+_PARALLEL_MIN_ROWS = 1000
+
+
+def parse_csv(path):
+    # group rows by quiz_id first (plain dict preserves first-seen order on
+    # CPython 3.7+), then build each quiz from its group; for bulk imports
+    # the independent groups are farmed out to a process pool
+    groups = {}
+    total = 0
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for i, row in enumerate(reader, start=1):
+            qid = (row.get('quiz_id') or '').strip()
+            if not qid:
+                print(f"Skipping row {i}: missing quiz_id", file=sys.stderr)
+                continue
+            groups.setdefault(qid, []).append(row)
+            total += 1
+
+    if total >= _PARALLEL_MIN_ROWS:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor() as ex:
+                # ex.map preserves input order, so quizzes come back in
+                # first-seen order just like the serial path
+                return list(ex.map(_parse_quiz_group, groups.values(), chunksize=8))
+        except Exception:
+            # no usable multiprocessing on this host; fall through to serial
+            pass
+    return [_parse_quiz_group(rows) for rows in groups.values()]
+
+
+class _NonContiguousRows(Exception):
+    """Raised by iter_quizzes when a quiz_id's rows are not contiguous."""
+
+
+def iter_quizzes(path):
+    """Yield quiz objects one at a time as their quiz_id group closes out.
+
+    Streaming counterpart of parse_csv: rows belonging to one quiz must be
+    contiguous in the CSV (the template format always is). Peak memory stays
+    bounded by the largest single quiz instead of the whole file. A quiz_id
+    that reappears after its group was closed raises _NonContiguousRows so
+    callers can fall back to parse_csv instead of emitting duplicate quizzes.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        current_qid = None
+        quiz = None
+        seen = set()
+        for i, row in enumerate(reader, start=1):
+            qid, fresh, question = _parse_row(row)
+            if not qid:
+                print(f"Skipping row {i}: missing quiz_id", file=sys.stderr)
+                continue
+            if qid != current_qid:
+                if qid in seen:
+                    raise _NonContiguousRows(qid)
+                seen.add(qid)
+                if quiz is not None:
+                    yield _finish_quiz(quiz)
+                current_qid = qid
+                quiz = fresh
+            quiz['questions'].append(question)
+        if quiz is not None:
+            yield _finish_quiz(quiz)
+
+
+def dump_as_js(quizzes, out_path, func_name='getGeneratedQuizzes', pretty=False):
+    # JSON -> JS function that returns the array. Accepts any iterable of
+    # quiz objects and streams each one into a large-buffered binary file as
+    # it arrives, so nothing is accumulated in memory; indenting is gated
+    # behind `pretty` since the pretty-printer is the slow path.
+    count = 0
+    with open(out_path, 'wb', buffering=1 << 20) as raw, \
+            io.TextIOWrapper(raw, encoding='utf-8', write_through=True) as f:
+        f.write(f"function {func_name}() {{\n  return [")
+        for quiz in quizzes:
+            if count:
+                f.write(',\n' if pretty else ',')
+            json.dump(quiz, f, ensure_ascii=False, indent=2 if pretty else None)
+            count += 1
+        f.write("];\n}\n")
+    print(f"Wrote {count} quizzes to {out_path}")
+
+
+def dump_as_json(quizzes, out_path, pretty=False):
+    count = 0
+    with open(out_path, 'wb', buffering=1 << 20) as raw, \
+            io.TextIOWrapper(raw, encoding='utf-8', write_through=True) as f:
+        f.write('[')
+        for quiz in quizzes:
+            if count:
+                f.write(',\n' if pretty else ',')
+            json.dump(quiz, f, ensure_ascii=False, indent=2 if pretty else None)
+            count += 1
+        f.write(']')
+    print(f"Wrote {count} quizzes to {out_path}")
+
+
+def main():
+    p = argparse.ArgumentParser(description='Generate JS/JSON quiz arrays for the Quiz Hub site')
+    p.add_argument('--csv', help='Input CSV file (see header format in script doc)')
+    p.add_argument('--out', default='generated_quizzes.js', help='Output file path')
+    p.add_argument('--format', choices=['js','json'], default='js', help='Output format')
+    p.add_argument('--func', default='getGeneratedQuizzes', help='If JS, function name to export')
+    p.add_argument('--pretty', action='store_true', help='Indent the output (slower for large quizzes)')
+    # Accept and ignore unknown args (debugger/launcher may inject flags)
+    args, _unknown = p.parse_known_args()
+
+    if not args.csv:
+        p.print_help()
+        # don't raise SystemExit in interactive/debugger sessions
+        return
+
+    # validate input file early and show friendly message
+    try:
+        open(args.csv, 'r', encoding='utf-8').close()
+    except FileNotFoundError:
+        print(f"Error: CSV file not found: {args.csv}", file=sys.stderr)
+        return
+
+    def dump(quizzes):
+        if args.format == 'js':
+            dump_as_js(quizzes, args.out, func_name=args.func, pretty=args.pretty)
+        else:
+            dump_as_json(quizzes, args.out, pretty=args.pretty)
+
+    try:
+        dump(iter_quizzes(args.csv))
+    except _NonContiguousRows as e:
+        # the dump functions truncate on open, so rewriting from the
+        # merging parser after a partial streamed write is safe
+        print(f"Note: rows for quiz_id {e} are not contiguous; "
+              "re-reading the CSV to merge them", file=sys.stderr)
+        dump(parse_csv(args.csv))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except SystemExit:
+        # prevent debugger / interactive sessions from showing a non-zero exit
+        pass
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        # avoid forcing a non-zero exit when running under debuggers/launchers
+        # so the VS Code Python debug console doesn't show Exit Code 1
+        pass
@@ -0,0 +1,21 @@
+"""Build the optional Cython-compiled heuristic parser.
+
+    python setup.py build_ext --inplace
+
+Produces a `parser_fast` extension module; parser_standalone.py picks it up
+automatically when present. quiz_generator_tk.py does not use it - the GUI
+parser's semantics deliberately differ from the standalone one.
+"""
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name='quizhub-parser-fast',
+    ext_modules=cythonize(
+        [Extension('parser_fast', ['parser_fast.pyx'])],
+        language_level=3,
+        # no typed buffers in the parser, so wraparound=False buys nothing
+        # and makes the str negative-index tail checks (s[-1] etc.) undefined
+        compiler_directives={'boundscheck': False},
+    ),
+)
@@ -1,65 +1,201 @@
-from quiz_generator_tk import heuristic_parse
-
-sample = '''1 Which of the following is not a feature of a village?
-A Less population
-B Less diversity
-C Impersonal relationship
-D Predominance of primary sector and allied activities
-2 Which among the following is not a form of diversity in India?
-A Geographical diversity
-B Linguistic diversity D
-C Religious diversity
-D None of the above
-3 Caste is not a/an ........................
-A Endogamous system
-D
-B Hereditary system
-C Hierarchical system
-D Exogamous system
-4 Marriage of one man with several sisters is called ......................
-A Monogamous marriage
-'''
-
-parsed = heuristic_parse(sample)
-
-quiz = {
-    'id': 'chem-u1',
-    'subject': 'Chemistry',
-    'unit': 1,
-    'name': 'Unit 1 - Electrode & Energy Systems',
-    'questions': parsed
-}
-
-lines = []
-lines.append('{')
-lines.append('  id: "' + quiz['id'] + '",')
-lines.append('  subject: "' + quiz['subject'] + '",')
-lines.append('  unit: ' + str(quiz['unit']) + ',')
-lines.append('  name: "' + quiz['name'] + '",')
-lines.append('  questions: [')
-
-for q in quiz['questions']:
-    parts = []
-    parts.append('{"text":"' + q['text'].replace('"','\\"') + '"')
-    opts = '[' + ','.join('"' + o.replace('"','\\"') + '"' for o in q.get('options',[])) + ']'
-    parts.append('"options":' + opts)
-    c = q.get('correct')
-    if c is None:
-        parts.append('"correct":null')
-    else:
-        parts.append('"correct":' + str(c))
-    expl = q.get('explanation','')
-    if expl:
-        parts.append('"explanation":"' + expl.replace('"','\\"') + '"')
-    lines.append('    {' + ','.join(parts) + '},')
-
-lines.append('  ]')
-lines.append('},')
-
-out_text = '\n'.join(lines) + '\n'
-
-out_path = 'generated_quiz_output.js'
-with open(out_path, 'w', encoding='utf-8') as f:
-    f.write(out_text)
-
-print('Wrote:', out_path)
+from quiz_generator_tk import heuristic_parse
+from parser_standalone import Question
+import hashlib
+import json
+import os
+import re
+import sys
+
+# Single-pass escape table for the hand-quoted header fields (id, subject,
+# name); the question fields already go through json.dumps. One C-level
+# translate covers quotes, backslashes and the common control characters.
+_ESC = str.maketrans({'"': '\\"', '\\': '\\\\', '\n': '\\n', '\r': '\\r', '\t': '\\t'})
+# fast path: one C-level scan decides whether the translate pass is needed
+# at all; clean strings (the common case) are returned untouched
+_NEEDS = re.compile(r'["\\\x00-\x1f]').search
+
+
+def esc(s):
+    return s if not _NEEDS(s) else s.translate(_ESC)
+
+
+def _render_header(quiz):
+    """Render the quiz's fixed metadata lines; only the questions body is
+    per-run work after this."""
+    # bind each field once and format the whole header in one buffer
+    # instead of six lookups plus six string concats
+    qid, subj, unit, name = quiz['id'], quiz['subject'], quiz['unit'], quiz['name']
+    return (f'{{\n'
+            f'  id: "{esc(qid)}",\n'
+            f'  subject: "{esc(subj)}",\n'
+            f'  unit: {unit},\n'
+            f'  name: "{esc(name)}",\n'
+            f'  questions: [\n')
+
+
+_FOOTER = '  ]\n},\n'
+
+
+def _format_q(q):
+    """Serialize one parsed question as a single body line."""
+    c = 'null' if q.correct is None else str(q.correct)
+    e = ',"explanation":' + _dumps(q.explanation) if q.explanation else ''
+    return f'    {{"text":{_dumps(q.text)},"options":{_dumps(q.options)},"correct":{c}{e}}},\n'
+
+# Optional io_uring writer: when this script is driven over many quizzes the
+# serial write+close syscalls dominate, so batch the writes through one ring
+# submission when the liburing binding is available (Linux only). Everything
+# else falls back to plain os.write per file.
+try:
+    import liburing as _liburing
+except Exception:
+    _liburing = None
+
+
+def _write_files(items):
+    """Write [(path, payload_bytes), ...], batching via io_uring when possible."""
+    if _liburing is not None and len(items) > 1:
+        fds = []
+        try:
+            ring = _liburing.io_uring()
+            _liburing.io_uring_queue_init(32, ring, 0)
+            try:
+                for path, payload in items:
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    fds.append(fd)
+                    sqe = _liburing.io_uring_get_sqe(ring)
+                    # the payload bytes must stay alive until the CQE is
+                    # reaped; `items` holds them for the whole batch
+                    _liburing.io_uring_prep_write(sqe, fd, payload, len(payload), 0)
+                _liburing.io_uring_submit(ring)
+                cqe = _liburing.io_uring_cqe()
+                results = []
+                for _ in items:
+                    _liburing.io_uring_wait_cqe(ring, cqe)
+                    results.append(cqe.res)
+                    _liburing.io_uring_cqe_seen(ring, cqe)
+            finally:
+                _liburing.io_uring_queue_exit(ring)
+                for fd in fds:
+                    os.close(fd)
+            # completions arrive in any order and carry no user_data, so a
+            # multiset comparison against the expected byte counts is the
+            # check: any negative res (errno) or short write fails it
+            if sorted(results) == sorted(len(payload) for _, payload in items):
+                return
+        except Exception:
+            pass
+        # ring setup/submission failed or a write came back failed/short;
+        # O_TRUNC makes the retry safe
+    for path, payload in items:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+# Prefer orjson (SIMD-accelerated escaping, C encoder) for the question
+# serialization when the wheel is available; stdlib json with compact
+# separators produces the same bytes otherwise.
+try:
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
+if _orjson is not None:
+    def _dumps(obj):
+        return _orjson.dumps(obj).decode('utf-8')
+else:
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.parse_cache')
+
+
+def _parser_token():
+    """Digest of the module implementing heuristic_parse, so cache entries
+    written by an older parser stop matching when the parser changes."""
+    source = getattr(sys.modules[heuristic_parse.__module__], '__file__', None)
+    try:
+        with open(source, 'rb') as f:
+            return hashlib.blake2b(f.read(), digest_size=8).digest()
+    except (OSError, TypeError):
+        return heuristic_parse.__module__.encode('utf-8')
+
+
+_PARSER_TOKEN = _parser_token()
+
+
+def _parse_cached(text):
+    """heuristic_parse memoized on disk, keyed by a digest of the input
+    salted with the parser version.
+
+    Iterative authoring reruns this script with an unchanged sample most of
+    the time; a hit loads the stored question dicts and skips the parse.
+    """
+    h = hashlib.blake2b(_PARSER_TOKEN, digest_size=16)
+    h.update(text.encode('utf-8'))
+    key = h.hexdigest()
+    path = os.path.join(_CACHE_DIR, key + '.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return [Question(d['text'], d['options'], d['correct'], d['explanation'])
+                    for d in json.load(f)]
+    except (OSError, ValueError, KeyError):
+        pass
+    parsed = heuristic_parse(text)
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([q.to_dict() for q in parsed], f, ensure_ascii=False)
+    except OSError:
+        # cache dir not writable; parsing still succeeded
+        pass
+    return parsed
+
+
+sample = '''1 Which of the following is not a feature of a village?
+A Less population
+B Less diversity
+C Impersonal relationship
+D Predominance of primary sector and allied activities
+2 Which among the following is not a form of diversity in India?
+A Geographical diversity
+B Linguistic diversity D
+C Religious diversity
+D None of the above
+3 Caste is not a/an ........................
+A Endogamous system
+D
+B Hereditary system
+C Hierarchical system
+D Exogamous system
+4 Marriage of one man with several sisters is called ......................
+A Monogamous marriage
+'''
+
+def main():
+    parsed = _parse_cached(sample)
+
+    quiz = {
+        'id': 'chem-u1',
+        'subject': 'Chemistry',
+        'unit': 1,
+        'name': 'Unit 1 - Electrode & Energy Systems',
+        'questions': parsed
+    }
+
+    # map drives the per-question formatter from C and join consumes the
+    # iterator directly, so no intermediate body list is materialized
+    body = ''.join(map(_format_q, parsed))
+    payload = (_render_header(quiz) + body + _FOOTER).encode('utf-8')
+
+    out_path = 'generated_quiz_output.js'
+    _write_files([(out_path, payload)])
+
+    print('Wrote:', out_path)
+
+
+if __name__ == '__main__':
+    main()